@@ -3,54 +3,216 @@ Main Agent Workflow — Entry Point
 Orchestrates monitoring, AI analysis, healing actions, and the web dashboard.
 """
 
+import functools
+import itertools
 import logging
+import logging.config
 import os
+import queue
 import sys
 import signal
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
 
-from agent_config import AGENT_CONFIG
-from gcp_monitor import GCPMonitor
+import cachetools
+import orjson
+
+from agent_config import get_config
+from gcp_monitor import GCPMonitor, WatchExpired
 from healing_actions import HealingActions
 
+try:
+    from dashboard import set_status, set_config, record_check, record_issues, \
+        record_action, record_incident, start_dashboard
+    _DASHBOARD_AVAILABLE = True
+except ImportError:
+    _DASHBOARD_AVAILABLE = False
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Logging setup
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _setup_logging():
-    level = getattr(logging, AGENT_CONFIG["log_level"].upper(), logging.INFO)
-    fmt = "%(asctime)s  %(levelname)-8s  %(name)s  %(message)s"
-    logging.basicConfig(level=level, format=fmt, stream=sys.stdout)
-    # Quieten noisy libraries
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("google").setLevel(logging.WARNING)
-    logging.getLogger("kubernetes").setLevel(logging.WARNING)
+# Noisy library loggers (and the dashboard's Flask app logger) kept at WARNING
+_QUIET_LOGGERS = ("urllib3", "google", "kubernetes", "werkzeug", "dashboard")
+
+
+def _setup_logging(config):
+    level = config["log_level"].upper()
+    if not isinstance(logging.getLevelName(level), int):
+        level = "INFO"
+    logging.config.dictConfig({
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {"format": "%(asctime)s  %(levelname)-8s  %(name)s  %(message)s"},
+        },
+        "handlers": {
+            "stdout": {"class": "logging.StreamHandler", "formatter": "default",
+                       "stream": sys.stdout},
+        },
+        "loggers": {name: {"level": "WARNING"} for name in _QUIET_LOGGERS},
+        "root": {"level": level, "handlers": ["stdout"]},
+    })
 
 
 logger = logging.getLogger("self-healing-agent")
 
 # Graceful shutdown flag
-_running = True
+_stop = threading.Event()
+
+# Issues reported by the per-namespace pod watchers, one list per pod event;
+# None is a shutdown sentinel that wakes the main loop
+_issue_queue = queue.Queue()
+
+# Most pods whose logs are fetched for one group of related issues
+_MAX_LOG_PODS = 3
+
+# Longest the main loop waits for a batch's log fetches before analyzing without them
+_LOG_WAIT_SECONDS = 15
+
+# (filename, data, append) writes waiting for the report writer thread: incident
+# reports, and incidents archived out of the healer's in-memory history
+_report_queue = queue.Queue(maxsize=256)
+
+# Recent AI analyses keyed by (namespace, deployment, issue type, restart count)
+_analysis_cache = cachetools.TTLCache(maxsize=512, ttl=300)
+
+# Backoff gate for issues that keep recurring, keyed by (namespace, deployment,
+# issue type) → (retry_at, delay, analysis). Each re-analysis doubles the delay;
+# an entry expires, resetting the delay, once the issue has been quiet a while.
+_ANALYSIS_BACKOFF_BASE = 60
+_ANALYSIS_BACKOFF_MAX = 3600
+_analysis_backoff = cachetools.TTLCache(maxsize=512, ttl=2 * _ANALYSIS_BACKOFF_MAX)
+# Guards both analysis caches, which pod watchers consult when prefetching logs
+_analysis_lock = threading.Lock()
+
+# Set once the watch threads are running; from then on only the pod watchers
+# re-seed the pod cache
+_watching = threading.Event()
+
+# Runs the per-namespace pod checks of a check cycle concurrently (set up in main)
+_ns_pool = None
+
+# Fetches pod logs in the background, as soon as issues are detected (set up in main)
+_log_pool = None
+
+# In-flight log fetches keyed by (namespace, pod, restart count) → (future,
+# issue group key), so a fetch started at detection time is joined rather than
+# repeated. Finished fetches drop out; their logs are then served from
+# GCPMonitor's log cache.
+_log_fetches = {}
+_log_fetches_lock = threading.Lock()
 
 
 def _signal_handler(signum, frame):
-    global _running
     logger.info("Received shutdown signal — stopping agent")
-    _running = False
+    _stop.set()
+    # Wake the main loop; put from another thread, since the signal may have
+    # interrupted the main thread while it held the queue's lock
+    threading.Thread(target=_issue_queue.put, args=(None,), daemon=True).start()
 
 
 signal.signal(signal.SIGINT, _signal_handler)
 signal.signal(signal.SIGTERM, _signal_handler)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Informer cache — local view of watched objects
+# ─────────────────────────────────────────────────────────────────────────────
+
+class InformerCache:
+    """Local copy of pods, ReplicaSets and Deployments kept current by watch events.
+
+    Lets owner lookups and reconciliation checks be answered from memory
+    instead of live apiserver calls. Objects are keyed by (namespace, name).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pods_by_ns_name = {}
+        # Namespaces whose pods were seeded from a full list and kept current since
+        self._synced_pod_namespaces = set()
+        self.replica_sets_by_ns_name = {}
+        self.deployments_by_ns_name = {}
+        self._stores = {
+            "pods": self.pods_by_ns_name,
+            "replicasets": self.replica_sets_by_ns_name,
+            "deployments": self.deployments_by_ns_name,
+        }
+
+    def update(self, kind, event_type, obj):
+        """Apply a watch event for the given kind ("pods", "replicasets", "deployments")."""
+        key = (obj.metadata.namespace, obj.metadata.name)
+        store = self._stores[kind]
+        with self._lock:
+            if event_type == "DELETED":
+                store.pop(key, None)
+            else:
+                store[key] = obj
+
+    def replace_pods(self, namespace, pods):
+        """Replace a namespace's cached pods with the result of a full list."""
+        with self._lock:
+            for key in [key for key in self.pods_by_ns_name if key[0] == namespace]:
+                del self.pods_by_ns_name[key]
+            for pod in pods:
+                self.pods_by_ns_name[(namespace, pod.metadata.name)] = pod
+            self._synced_pod_namespaces.add(namespace)
+
+    def invalidate_pods(self, namespace):
+        """Mark a namespace's cached pods as stale until the next replace_pods()."""
+        with self._lock:
+            self._synced_pod_namespaces.discard(namespace)
+
+    def pods(self, namespace):
+        """Return a tuple of the namespace's cached pods, or None if it isn't synced."""
+        with self._lock:
+            if namespace not in self._synced_pod_namespaces:
+                return None
+            return tuple(pod for (ns, _), pod in self.pods_by_ns_name.items() if ns == namespace)
+
+    def deployment_containers(self, deployment_name, namespace):
+        """Return the container names of a cached Deployment, or None if not cached."""
+        with self._lock:
+            deployment = self.deployments_by_ns_name.get((namespace, deployment_name))
+            if deployment is None:
+                return None
+            return [c.name for c in deployment.spec.template.spec.containers]
+
+    def owner_deployment(self, pod_name, namespace):
+        """Resolve a pod's Deployment via cached ownerReferences, or None if not cached."""
+        with self._lock:
+            pod = self.pods_by_ns_name.get((namespace, pod_name))
+            if pod is None:
+                return None
+            for owner in (pod.metadata.owner_references or []):
+                if owner.kind != "ReplicaSet":
+                    continue
+                rs = self.replica_sets_by_ns_name.get((namespace, owner.name))
+                if rs is None:
+                    return None
+                for rs_owner in (rs.metadata.owner_references or []):
+                    if rs_owner.kind == "Deployment" and \
+                            (namespace, rs_owner.name) in self.deployments_by_ns_name:
+                        return rs_owner.name
+        return None
+
+
+_informer = InformerCache()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Main loop
 # ─────────────────────────────────────────────────────────────────────────────
 
 def main():
-    _setup_logging()
-    config = AGENT_CONFIG
+    global _ns_pool, _log_pool
+    config = get_config()
+    _setup_logging(config)
 
     logger.info("=" * 60)
     logger.info(f"  {config['name']}  v{config['version']}")
@@ -63,16 +225,14 @@ def main():
     logger.info("=" * 60)
 
     # ── Start web dashboard ──────────────────────────────────────────────
+    if config["dashboard_enabled"] and not _DASHBOARD_AVAILABLE:
+        logger.warning("Flask or waitress not installed — dashboard disabled")
+        config["dashboard_enabled"] = False
     if config["dashboard_enabled"]:
         try:
-            from dashboard import start_dashboard, set_status, set_config, \
-                record_check, record_action, record_incident
             set_config(config["dry_run"], config["namespaces"])
             start_dashboard(port=config["dashboard_port"])
             logger.info(f"Dashboard: http://localhost:{config['dashboard_port']}")
-        except ImportError:
-            logger.warning("Flask not installed — dashboard disabled")
-            config["dashboard_enabled"] = False
         except Exception as e:
             logger.warning(f"Dashboard failed to start: {e}")
             config["dashboard_enabled"] = False
@@ -83,56 +243,157 @@ def main():
         cluster_name=config["gke_cluster"],
         vertex_ai_location=config["vertex_ai_location"],
         model_name=config["model"],
+        log_cache_seconds=config["safety"]["cooldown_seconds"],
     )
     healer = HealingActions(
         dry_run=config["dry_run"],
         max_actions_per_hour=config["safety"]["max_actions_per_hour"],
         cooldown_seconds=config["safety"]["cooldown_seconds"],
+        api_client=monitor.api_client,
+        archive=_archive_incident,
+    )
+
+    threading.Thread(target=_report_writer, name="report-writer", daemon=True).start()
+    _ns_pool = ThreadPoolExecutor(
+        max_workers=max(1, min(16, len(_watched_namespaces(config)))),
+        thread_name_prefix="check",
     )
+    _log_pool = ThreadPoolExecutor(max_workers=4 * _MAX_LOG_PODS, thread_name_prefix="logs")
 
     if config["dashboard_enabled"]:
         set_status("running")
 
+    # ── Initial full check, then follow pod events ───────────────────────
+    # The initial list seeds the pod cache and pod watches resume from its
+    # resourceVersion; the periodic full check re-examines the cached pods.
+    _reconcile(config, monitor, healer)
+    _start_watchers(config, monitor)
+    next_reconcile = time.time() + config["check_interval"]
+
     # ── Main monitoring loop ─────────────────────────────────────────────
-    while _running:
+    while not _stop.is_set():
+        wait = next_reconcile - time.time()
+        if wait <= 0:
+            _reconcile(config, monitor, healer)
+            next_reconcile = time.time() + config["check_interval"]
+            continue
+
+        # Block until a pod event arrives, reconciliation is due, or shutdown
+        try:
+            issues = _issue_queue.get(timeout=wait)
+        except queue.Empty:
+            continue
+        if issues is None:
+            break
+
         try:
-            _run_check_cycle(config, monitor, healer)
+            _process_pod_event(config, monitor, healer, issues)
         except KeyboardInterrupt:
             break
         except Exception as e:
-            logger.exception(f"Unexpected error in check cycle: {e}")
-            if config["dashboard_enabled"]:
-                set_status("error")
-
-        # Sleep in small increments so we can respond to SIGTERM quickly
-        for _ in range(config["check_interval"]):
-            if not _running:
-                break
-            time.sleep(1)
+            logger.exception(f"Unexpected error handling pod event: {e}")
 
+    _ns_pool.shutdown()
+    _log_pool.shutdown()
+    # Flush incident reports that are still queued
+    _report_queue.join()
     logger.info("Agent stopped.")
     if config["dashboard_enabled"]:
         set_status("stopped")
 
 
-def _run_check_cycle(config, monitor, healer):
-    """Run one full monitor → analyze → heal cycle across all namespaces."""
+def _watched_namespaces(config):
+    """Return the configured namespaces, minus the excluded ones."""
+    namespaces = (ns.strip() for ns in config["namespaces"])
+    return [ns for ns in namespaces if ns not in config["safety"]["excluded_namespaces"]]
+
+
+def _start_watchers(config, monitor):
+    """Start background watch threads for pods, ReplicaSets and Deployments per namespace."""
+    for ns in _watched_namespaces(config):
+        watchers = {
+            "pods": functools.partial(_watch_pods, config, monitor, ns),
+            "replicasets": functools.partial(_watch_workloads, monitor, ns, "replicasets"),
+            "deployments": functools.partial(_watch_workloads, monitor, ns, "deployments"),
+        }
+        for kind, consume in watchers.items():
+            thread = threading.Thread(
+                target=_keep_watching, args=(f"{kind} in '{ns}'", consume),
+                name=f"watch-{kind}-{ns}", daemon=True,
+            )
+            thread.start()
+        logger.info(f"Watching pod events in namespace: {ns}")
+    _watching.set()
+
+
+def _keep_watching(what, consume):
+    """Run a watch consumer until shutdown, reconnecting after failures."""
+    while not _stop.is_set():
+        try:
+            consume()
+        except Exception as e:
+            logger.warning(f"Watch on {what} failed: {e} — reconnecting")
+            _stop.wait(timeout=5)
+
+
+def _watch_pods(config, monitor, namespace):
+    """Keep the pod cache current and queue the issues each pod event reveals."""
+    if _informer.pods(namespace) is None:
+        _informer.replace_pods(namespace, monitor.list_pods(namespace))
+    try:
+        for event_type, pod, issues in monitor.watch_pod_health(namespace=namespace):
+            _informer.update("pods", event_type, pod)
+            if issues:
+                _prefetch_logs(config, monitor, issues)
+                _issue_queue.put(issues)
+    except WatchExpired:
+        # Events may have been missed; re-seed the cache from a fresh list
+        # before resuming. A watch the apiserver simply closed resumes as is.
+        _informer.invalidate_pods(namespace)
+
+
+def _watch_workloads(monitor, namespace, kind):
+    """Keep the ReplicaSet or Deployment cache current."""
+    try:
+        for event_type, obj in monitor.watch_workloads(kind, namespace=namespace):
+            _informer.update(kind, event_type, obj)
+    except WatchExpired:
+        pass  # Resume from the current state on the next call
+
+
+def _reconcile(config, monitor, healer):
+    """Run a full check cycle, reporting failures instead of raising."""
+    try:
+        _run_check_cycle(config, monitor, healer)
+    except Exception as e:
+        logger.exception(f"Unexpected error in check cycle: {e}")
+        if config["dashboard_enabled"]:
+            set_status("error")
+
+
+def _process_pod_event(config, monitor, healer, issues):
+    """Handle the issues reported by a single pod watch event."""
     if config["dashboard_enabled"]:
-        from dashboard import record_check, record_action, record_incident
+        record_issues(issues)
 
-    all_issues = []
+    _handle_issues(config, monitor, healer, issues)
 
-    for ns in config["namespaces"]:
-        ns = ns.strip()
-        if ns in config["safety"]["excluded_namespaces"]:
-            continue
 
-        logger.info(f"Checking namespace: {ns}")
-        issues = monitor.check_pod_health(namespace=ns)
-        all_issues.extend(issues)
+def _run_check_cycle(config, monitor, healer):
+    """Run one full monitor → analyze → heal cycle across all namespaces."""
+    all_issues = []
+
+    # Namespaces are checked in parallel, so a cycle that has to list pods
+    # costs one apiserver round trip
+    namespaces = _watched_namespaces(config)
+    logger.info(f"Checking namespaces: {', '.join(namespaces)}")
+    futures = [_ns_pool.submit(_check_namespace, monitor, ns) for ns in namespaces]
+    for future in as_completed(futures):
+        all_issues.extend(future.result())
 
     if config["dashboard_enabled"]:
         record_check(all_issues)
+    _prefetch_logs(config, monitor, all_issues)
 
     if not all_issues:
         logger.info("All healthy — no issues detected")
@@ -140,29 +401,232 @@ def _run_check_cycle(config, monitor, healer):
 
     logger.warning(f"Found {len(all_issues)} issue(s)")
 
-    for issue in all_issues:
-        _handle_issue(config, monitor, healer, issue)
+    _handle_issues(config, monitor, healer, all_issues)
 
 
-def _handle_issue(config, monitor, healer, issue):
-    """Process a single issue: gather context → AI analysis → healing action."""
-    if config["dashboard_enabled"]:
-        from dashboard import record_action, record_incident
+def _check_namespace(monitor, namespace):
+    """Check a namespace's pods from the informer cache, listing them if it isn't synced.
+
+    Before the watchers start, the list seeds the cache. Afterwards an unsynced
+    namespace is being re-seeded by its pod watcher, so the list is only used
+    for this check and leaves the cache and resourceVersion to the watcher.
+    """
+    pods = _informer.pods(namespace)
+    if pods is None:
+        seeding = not _watching.is_set()
+        try:
+            pods = monitor.list_pods(namespace, record_version=seeding)
+        except Exception as e:
+            logger.error(f"Failed to list pods in namespace '{namespace}': {e}")
+            return []
+        if seeding:
+            _informer.replace_pods(namespace, pods)
+    return monitor.check_pod_health(namespace=namespace, pods=pods)
+
+
+def _handle_issues(config, monitor, healer, issues):
+    """Group issues by (namespace, deployment, type) and handle each group together.
+
+    Pods of one Deployment failing the same way share a root cause, so each
+    group gets a single AI analysis instead of one per pod, and the groups
+    still needing analysis share a single Gemini request.
+    """
+    def group_key(issue):
+        namespace = issue.get("namespace") or ""
+        pod_name = issue.get("pod")
+        deployment = _resolve_deployment(monitor, pod_name, namespace) if pod_name else ""
+        return (namespace, deployment, issue.get("type") or "")
+
+    keyed = sorted(((group_key(issue), issue) for issue in issues), key=lambda pair: pair[0])
+    groups = [(key, [issue for _, issue in group])
+              for key, group in itertools.groupby(keyed, key=lambda pair: pair[0])]
+
+    analyses = {}
+    pending = []
+    for key, group in groups:
+        first = group[0]
+        logger.info(f"Processing: {first.get('type')} on {first.get('namespace')}/{first.get('pod')}")
+        if len(group) > 1:
+            logger.info(f"Sharing analysis with {len(group) - 1} related issue(s)")
+        analysis = _recall_analysis(key, first)
+        if analysis is not None:
+            logger.info("Reusing recent analysis for this issue")
+            analyses[key] = analysis
+        else:
+            pending.append((key, group))
+
+    if pending:
+        # ── Gather context ───────────────────────────────────────────
+        logs = _gather_logs(config, monitor, [group for _, group in pending])
+
+        # ── AI analysis ──────────────────────────────────────────────
+        firsts = [group[0] for _, group in pending]
+        for (key, group), analysis in zip(pending, monitor.analyze_batch(firsts, logs)):
+            _remember_analysis(key, group[0], analysis)
+            analyses[key] = analysis
+
+    for key, group in groups:
+        analysis = analyses[key]
+        logger.info(f"Analysis → root_cause: {analysis.get('root_cause', 'N/A')}")
+        for issue in group:
+            _heal_issue(config, monitor, healer, issue, analysis)
+
+
+def _recall_analysis(group_key, issue):
+    """Return a still-valid earlier analysis for this issue group, or None."""
+    with _analysis_lock:
+        analysis = _analysis_cache.get((*group_key, issue.get("restart_count")))
+        gate = _analysis_backoff.get(group_key)
+    if analysis is not None:
+        return analysis
+    if gate is not None and time.time() < gate[0]:
+        return gate[2]
+    return None
+
+
+def _remember_analysis(group_key, issue, analysis):
+    """Cache a fresh analysis and push back the next re-analysis of its group.
+
+    Rule-based fallbacks (Gemini failed or unavailable) are not cached, so
+    the group gets a real analysis as soon as Gemini answers again.
+    """
+    if analysis.get("recommended_action") == "apply_default_healing":
+        return
+    with _analysis_lock:
+        _analysis_cache[(*group_key, issue.get("restart_count"))] = analysis
+        gate = _analysis_backoff.get(group_key)
+        delay = min(gate[1] * 2, _ANALYSIS_BACKOFF_MAX) if gate else _ANALYSIS_BACKOFF_BASE
+        _analysis_backoff[group_key] = (time.time() + delay, delay, analysis)
+
+
+def _gather_logs(config, monitor, groups):
+    """Fetch logs for the pods behind each group of issues, one merged string per group.
+
+    All the pods' logs are fetched concurrently, reusing any prefetched ones.
+    """
+    fetches = []
+    for issues in groups:
+        issues_by_pod = {}
+        for issue in issues:
+            if issue.get("pod"):
+                issues_by_pod.setdefault(issue["pod"], issue)
+
+        # A few pods are enough to show a shared failure mode
+        fetches.append([
+            (pod_name, _fetch_logs(config, monitor, issue))
+            for pod_name, issue in list(issues_by_pod.items())[:_MAX_LOG_PODS]
+        ])
+
+    # One deadline for the whole batch, so a stalled fetch can't hold up the main loop
+    deadline = time.monotonic() + _LOG_WAIT_SECONDS
+    logs = []
+    for group_fetches in fetches:
+        pod_logs = [(pod_name, _fetch_result(pod_name, future, deadline))
+                    for pod_name, future in group_fetches]
+        if len(pod_logs) == 1:
+            logs.append(pod_logs[0][1])
+        else:
+            logs.append("\n".join(f"--- {pod_name} ---\n{text}" for pod_name, text in pod_logs))
+    return logs
+
+
+def _fetch_result(pod_name, future, deadline):
+    """Return a log fetch's result, or an error message if it isn't done by the deadline."""
+    try:
+        return future.result(timeout=max(0.0, deadline - time.monotonic()))
+    except FutureTimeoutError:
+        msg = f"Timed out fetching logs for {pod_name}"
+        logger.warning(msg)
+        return msg
+
+
+def _prefetch_logs(config, monitor, issues):
+    """Start fetching logs for newly detected issues, so they're ready by analysis time.
+
+    Issues are grouped by (namespace, deployment, type) as in _handle_issues,
+    and no group has more than _MAX_LOG_PODS fetches in flight. Issues whose
+    Deployment isn't cached yet, or whose group will reuse a recent analysis,
+    are left to be fetched when they're handled.
+    """
+    groups = {}
+    for issue in issues:
+        pod_name = issue.get("pod")
+        if not pod_name:
+            continue
+        namespace = issue.get("namespace") or ""
+        deployment = _informer.owner_deployment(pod_name, namespace)
+        if deployment is None:
+            continue
+        group_key = (namespace, deployment, issue.get("type") or "")
+        groups.setdefault(group_key, {}).setdefault(pod_name, issue)
+
+    for group_key, issues_by_pod in groups.items():
+        if _recall_analysis(group_key, next(iter(issues_by_pod.values()))) is not None:
+            continue
+        with _log_fetches_lock:
+            in_flight = {fetch_key[1] for fetch_key, (_, key) in _log_fetches.items()
+                         if key == group_key}
+        room = _MAX_LOG_PODS - len(in_flight)
+        for pod_name, issue in issues_by_pod.items():
+            if room <= 0:
+                break
+            if pod_name in in_flight:
+                continue
+            if _stop.is_set():
+                return  # _log_pool may already be shut down
+            try:
+                _fetch_logs(config, monitor, issue, group_key)
+            except RuntimeError:
+                return  # _log_pool was shut down after the _stop check
+            room -= 1
+
+
+def _fetch_logs(config, monitor, issue, group_key=None):
+    """Return the in-flight log fetch for an issue's pod, starting one if needed."""
+    key = (issue.get("namespace"), issue["pod"], issue.get("restart_count"))
+    with _log_fetches_lock:
+        fetch = _log_fetches.get(key)
+        if fetch is not None:
+            return fetch[0]
+        future = _log_pool.submit(
+            monitor.get_pod_logs,
+            issue["pod"], issue.get("namespace"),
+            tail_lines=200,
+            since_seconds=_log_window_seconds(config, issue),
+            restart_count=issue.get("restart_count"),
+        )
+        _log_fetches[key] = (future, group_key)
+    # Registered outside the lock: it runs at once if the fetch already finished
+    future.add_done_callback(lambda done: _forget_log_fetch(key, done))
+    return future
 
-    pod_name = issue.get("pod")
-    namespace = issue.get("namespace")
-    issue_type = issue.get("type")
 
-    logger.info(f"Processing: {issue_type} on {namespace}/{pod_name}")
+def _forget_log_fetch(key, future):
+    """Drop a finished fetch from _log_fetches, unless a newer one has replaced it."""
+    with _log_fetches_lock:
+        fetch = _log_fetches.get(key)
+        if fetch is not None and fetch[0] is future:
+            del _log_fetches[key]
 
-    # ── Gather context ───────────────────────────────────────────────
-    logs = ""
-    if pod_name:
-        logs = monitor.get_pod_logs(pod_name, namespace)
 
-    # ── AI analysis ──────────────────────────────────────────────────
-    analysis = monitor.analyze_with_gemini(issue, logs)
-    logger.info(f"Analysis → root_cause: {analysis.get('root_cause', 'N/A')}")
+def _log_window_seconds(config, issue):
+    """Return a log window reaching two check intervals back from the issue's detection.
+
+    Anchoring on detected_at keeps the lead-up to the failure in view even
+    when the issue waited a while before being analyzed.
+    """
+    lookback = config["check_interval"] * 2
+    try:
+        detected_at = datetime.fromisoformat(issue["detected_at"])
+    except (KeyError, TypeError, ValueError):
+        return lookback
+    elapsed = (datetime.utcnow() - detected_at).total_seconds()
+    return lookback + max(0, int(elapsed))
+
+
+def _heal_issue(config, monitor, healer, issue, analysis):
+    """Execute the healing action for one issue and report on it."""
+    issue_type = issue.get("type")
 
     # ── Determine and execute healing action ─────────────────────────
     action_result = _execute_healing(config, monitor, healer, issue, analysis)
@@ -174,16 +638,17 @@ def _handle_issue(config, monitor, healer, issue):
     # ── Generate incident report ─────────────────────────────────────
     report = healer.generate_incident_report(issue, analysis, action_result)
 
-    # Save report to disk
+    # Hand the report to the writer thread; the pod and type keep names unique
+    # when several reports are written within the same second
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     report_dir = os.environ.get("REPORT_DIR", ".")
-    filename = os.path.join(report_dir, f"incident_report_{timestamp}.md")
+    filename = os.path.join(
+        report_dir, f"incident_report_{timestamp}_{issue.get('pod')}_{issue_type}.md"
+    )
     try:
-        with open(filename, "w") as f:
-            f.write(report)
-        logger.info(f"Incident report saved: {filename}")
-    except OSError as e:
-        logger.warning(f"Could not save report: {e}")
+        _report_queue.put_nowait((filename, report.encode("utf-8"), False))
+    except queue.Full:
+        logger.warning(f"Report queue full — dropping report {filename}")
 
     # Update dashboard
     if config["dashboard_enabled"]:
@@ -193,29 +658,79 @@ def _handle_issue(config, monitor, healer, issue):
     logger.info(f"Result: {action_result.get('message', 'done')}")
 
 
+def _archive_incident(incident):
+    """Queue an incident evicted from the healer's history for today's JSONL archive.
+
+    The markdown report is already saved on its own, so it's left out.
+    """
+    record = {key: value for key, value in incident.items() if key != "report"}
+    filename = os.path.join(os.environ.get("REPORT_DIR", "."),
+                            f"incidents-{time.strftime('%Y%m%d')}.jsonl")
+    try:
+        _report_queue.put_nowait((filename, orjson.dumps(record, default=str) + b"\n", True))
+    except queue.Full:
+        logger.warning(f"Report queue full — dropping archived incident for {filename}")
+
+
+def _report_writer():
+    """Write queued incident reports and archive records to disk, one at a time."""
+    while True:
+        filename, data, append = _report_queue.get()
+        try:
+            data = memoryview(data)
+            flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if append else os.O_TRUNC)
+            fd = os.open(filename, flags, 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
+            if not append:
+                logger.info(f"Incident report saved: {filename}")
+        except OSError as e:
+            logger.warning(f"Could not save report: {e}")
+        finally:
+            _report_queue.task_done()
+
+
+def _increase_limits(healer, monitor, issue, defaults):
+    """Raise the limits of an issue's Deployment, using cached container names if known."""
+    deployment = _resolve_deployment(monitor, issue["pod"], issue["namespace"])
+    return healer.increase_resource_limits(
+        deployment, issue["namespace"],
+        defaults["oom_memory_increase"], defaults["oom_cpu_increase"],
+        container_names=_informer.deployment_containers(deployment, issue["namespace"]),
+    )
+
+
+# Healing action per issue type: fn(healer, monitor, issue, healing_defaults)
+_HEALERS = {
+    "oom_killed": _increase_limits,
+    "high_restart_count": lambda h, m, i, d: h.delete_pod(i["pod"], i["namespace"]),
+    "crash_loop_backoff": lambda h, m, i, d: h.delete_pod(i["pod"], i["namespace"]),
+    "pod_not_running": lambda h, m, i, d: h.restart_deployment(
+        _resolve_deployment(m, i["pod"], i["namespace"]), i["namespace"],
+    ),
+}
+
+
 def _execute_healing(config, monitor, healer, issue, analysis):
     """Map issue type to a healing action and execute it."""
-    issue_type = issue.get("type")
-    namespace = issue.get("namespace")
-    pod_name = issue.get("pod")
-    defaults = config["healing_defaults"]
+    heal = _HEALERS.get(issue.get("type"))
+    if heal is None:
+        return None
+    return heal(healer, monitor, issue, config["healing_defaults"])
 
-    if issue_type == "oom_killed":
-        deployment = monitor.get_deployment_for_pod(pod_name, namespace)
-        return healer.increase_resource_limits(
-            deployment, namespace,
-            defaults["oom_memory_increase"],
-            defaults["oom_cpu_increase"],
-        )
 
-    elif issue_type in ("high_restart_count", "crash_loop_backoff"):
-        return healer.delete_pod(pod_name, namespace)
+def _resolve_deployment(monitor, pod_name, namespace):
+    """Find a pod's Deployment from the informer cache, falling back to the apiserver.
 
-    elif issue_type == "pod_not_running":
+    The fallback covers pods not seen by a watch yet (e.g. unchanged since startup).
+    """
+    deployment = _informer.owner_deployment(pod_name, namespace)
+    if deployment is None:
         deployment = monitor.get_deployment_for_pod(pod_name, namespace)
-        return healer.restart_deployment(deployment, namespace)
-
-    return None
+    return deployment
 
 
 if __name__ == "__main__":
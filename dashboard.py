@@ -3,12 +3,15 @@ Web Dashboard for GKE Self-Healing Agent
 Provides real-time visibility into agent status, issues, and healing actions.
 """
 
-import json
+import gzip
 import logging
 import threading
+from collections import deque
 from datetime import datetime
 
-from flask import Flask, jsonify, render_template_string
+import orjson
+from flask import Flask, Response, request
+from waitress import serve
 
 logger = logging.getLogger("self-healing-agent.dashboard")
 
@@ -24,41 +27,67 @@ _state = {
     "actions_taken": 0,
     "dry_run": False,
     "namespaces": [],
-    "recent_issues": [],      # last 50 issues
-    "recent_actions": [],     # last 50 actions
-    "incidents": [],          # full incident reports
+    "recent_issues": deque(maxlen=50),    # last 50 issues
+    "recent_actions": deque(maxlen=50),   # last 50 actions
+    "incidents": deque(maxlen=20),        # last 20 incident reports
 }
 _lock = threading.Lock()
+# Signalled (under _lock) whenever _version changes, to wake /api/events streams
+_changed_cond = threading.Condition(_lock)
+
+# Bumped on every change to fields served by /api/status; used as its ETag
+_version = 0
+# Distinguishes ETags issued by this process from those of earlier runs
+_run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+
+# Fields of _state served by /api/status (incidents have their own endpoint)
+_STATUS_FIELDS = ("status", "started_at", "last_check", "checks_total",
+                  "issues_detected", "actions_taken", "dry_run")
 
 # ─────────────────────────────────────────────────────────────────────────────
 # State mutation helpers (called from agent_workflow)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _changed():
+    # Caller must hold _lock
+    global _version
+    _version += 1
+    _changed_cond.notify_all()
+
 def set_status(status):
     with _lock:
         _state["status"] = status
+        _changed()
 
 def set_config(dry_run, namespaces):
     with _lock:
         _state["dry_run"] = dry_run
         _state["namespaces"] = namespaces
-        _state["started_at"] = datetime.utcnow().isoformat()
+        _state["started_at"] = datetime.utcnow()
+        _changed()
 
 def record_check(issues):
     with _lock:
-        _state["last_check"] = datetime.utcnow().isoformat()
+        _state["last_check"] = datetime.utcnow()
         _state["checks_total"] += 1
-        _state["issues_detected"] += len(issues)
-        for issue in issues:
-            _state["recent_issues"].append(issue)
-            if len(_state["recent_issues"]) > 50:
-                _state["recent_issues"].pop(0)
+        _append_issues(issues)
+
+def record_issues(issues):
+    """Record issues reported between full checks (e.g. by a pod watch)."""
+    with _lock:
+        _append_issues(issues)
+
+def _append_issues(issues):
+    # Caller must hold _lock
+    _state["issues_detected"] += len(issues)
+    _state["recent_issues"].extend(issues)
+    _changed()
 
 def record_action(action_result, issue, analysis):
     with _lock:
         _state["actions_taken"] += 1
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "issue_type": issue.get("type"),
             "pod": issue.get("pod"),
             "namespace": issue.get("namespace"),
@@ -68,17 +97,22 @@ def record_action(action_result, issue, analysis):
             "message": action_result.get("message"),
         }
         _state["recent_actions"].append(entry)
-        if len(_state["recent_actions"]) > 50:
-            _state["recent_actions"].pop(0)
+        _changed()
+
+def _status_snapshot():
+    # Caller must hold _lock
+    return {
+        **{key: _state[key] for key in _STATUS_FIELDS},
+        "recent_issues": list(_state["recent_issues"]),
+        "recent_actions": list(_state["recent_actions"]),
+    }
 
 def record_incident(incident_report):
     with _lock:
         _state["incidents"].append({
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "report": incident_report[:2000],
         })
-        if len(_state["incidents"]) > 20:
-            _state["incidents"].pop(0)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -187,10 +221,8 @@ function shortTime(iso) {
   return new Date(iso + 'Z').toLocaleTimeString();
 }
 
-async function refresh() {
+function applyState(d) {
   try {
-    const r = await fetch('/api/status');
-    const d = await r.json();
     document.getElementById('status-badge').textContent = d.status.toUpperCase();
     document.getElementById('status-badge').className = 'badge ' + statusClass(d.status);
     document.getElementById('checks-total').textContent = d.checks_total;
@@ -224,48 +256,121 @@ async function refresh() {
         <td>${a.message || '—'}</td>
       </tr>`).join('');
     }
-  } catch(e) { console.error('Refresh error', e); }
+  } catch(e) { console.error('Render error', e); }
 }
 
-refresh();
-setInterval(refresh, 5000);
+// The server pushes a fresh snapshot whenever agent state changes. If it
+// refuses the stream (too many open), poll /api/status instead.
+let pollTimer = null;
+function poll() {
+  fetch('/api/status').then(r => r.ok ? r.json() : null)
+    .then(d => { if (d) applyState(d); }).catch(() => {});
+}
+const events = new EventSource('/api/events');
+events.onmessage = e => applyState(JSON.parse(e.data));
+events.onerror = () => {
+  if (events.readyState === EventSource.CLOSED && pollTimer === null) {
+    poll();
+    pollTimer = setInterval(poll, 5000);
+  }
+};
 </script>
 </body>
 </html>"""
 
+# The page has no template variables, so encode (and compress) it once
+_DASHBOARD_BODY = DASHBOARD_HTML.encode("utf-8")
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_BODY)
+
+
+def _json(obj):
+    """Build a JSON response encoded with orjson."""
+    return Response(orjson.dumps(obj), mimetype="application/json")
 
-def create_app():
+
+def create_app(max_event_streams=8):
+    """Build the dashboard app.
+
+    At most max_event_streams /api/events streams are served at once; each
+    holds a server thread, and further clients are refused so they poll.
+    """
+    # Flask and werkzeug log levels are set by agent_workflow._setup_logging
     app = Flask(__name__)
-    app.logger.setLevel(logging.WARNING)
-    # Suppress Flask request logs
-    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    event_streams = threading.BoundedSemaphore(max_event_streams)
 
     @app.route("/")
     def index():
-        return render_template_string(DASHBOARD_HTML)
+        if "gzip" in request.accept_encodings:
+            response = Response(_DASHBOARD_GZIP, mimetype="text/html")
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = Response(_DASHBOARD_BODY, mimetype="text/html")
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "public, max-age=300"
+        return response
 
     @app.route("/api/health")
     def health():
-        return jsonify({"status": "ok", "timestamp": datetime.utcnow().isoformat()})
+        return _json({"status": "ok", "timestamp": datetime.utcnow()})
 
     @app.route("/api/status")
     def status():
+        # Copy under the lock, encode outside it so writers aren't held up
         with _lock:
-            return jsonify({**_state})
+            etag = f"{_run_id}-{_version}"
+            snapshot = None if etag in request.if_none_match else _status_snapshot()
+        response = Response(status=304) if snapshot is None else _json(snapshot)
+        # Let pollers revalidate each request and get a 304 when nothing changed
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    @app.route("/api/events")
+    def events():
+        if not event_streams.acquire(blocking=False):
+            # The page falls back to polling /api/status when refused
+            return Response(status=503, headers={"Retry-After": "60"})
+
+        def stream():
+            seen = None
+            while True:
+                with _changed_cond:
+                    changed = _changed_cond.wait_for(lambda: _version != seen, timeout=15)
+                    if changed:
+                        seen = _version
+                        snapshot = _status_snapshot()
+                if changed:
+                    yield b"data: " + orjson.dumps(snapshot) + b"\n\n"
+                else:
+                    # Comment line keeps proxies from timing out idle streams
+                    yield b": keepalive\n\n"
+
+        response = Response(stream(), mimetype="text/event-stream",
+                            headers={"Cache-Control": "no-cache"})
+        # Runs when the server closes the response, including on client disconnect
+        response.call_on_close(event_streams.release)
+        return response
 
     @app.route("/api/incidents")
     def incidents():
         with _lock:
-            return jsonify(_state["incidents"])
+            snapshot = list(_state["incidents"])
+        return _json(snapshot)
 
     return app
 
 
-def start_dashboard(port=8080):
-    """Start the dashboard in a background thread."""
-    app = create_app()
+def start_dashboard(port=8080, threads=16):
+    """Start the dashboard on a waitress server in a background thread.
+
+    Each open /api/events stream occupies one of the server's threads, so
+    streams are capped at half of them to keep the page and /api/status
+    responsive.
+    """
+    app = create_app(max_event_streams=max(1, threads // 2))
     thread = threading.Thread(
-        target=lambda: app.run(host="0.0.0.0", port=port, debug=False, use_reloader=False),
+        target=serve, args=(app,),
+        kwargs={"host": "0.0.0.0", "port": port, "threads": threads, "_quiet": True},
         daemon=True,
     )
     thread.start()
@@ -3,19 +3,124 @@ GCP Monitoring and Logging Integration
 Provides cluster health monitoring, metrics collection, and AI-powered analysis.
 """
 
+import codecs
 import logging
+import re
+import threading
 import time
+from collections import deque
 from datetime import datetime, timedelta
 
-from kubernetes import client, config
+import cachetools
+from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+
+# Optional Google Cloud SDKs — their features are disabled when not installed
+try:
+    from google import genai
+except ImportError:
+    genai = None
+
+try:
+    from google.cloud import monitoring_v3
+except ImportError:
+    monitoring_v3 = None
 
 logger = logging.getLogger("self-healing-agent.monitor")
 
+# Minimum delay before retrying a failed Vertex AI client initialization
+_GENAI_RETRY_SECONDS = 300
+
+# Most bytes of a pod's log passed to Gemini; older output is dropped
+_MAX_LOG_BYTES = 8192
+
+# (connect, read) timeouts for pod log reads, so a stalled stream fails
+# instead of holding a log fetch open indefinitely
+_LOG_REQUEST_TIMEOUT = (5, 10)
+
+# Most distinct log lines passed to Gemini per pod, after de-duplication
+_MAX_DISTINCT_LOG_LINES = 50
+
+# Leading timestamp of a log line, e.g. "2024-05-01T12:00:00.123Z " or "[2024-05-01 12:00:00,123] "
+_LOG_TIMESTAMP = re.compile(
+    r"^\[?\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\]?\s*"
+)
+
+# Structured-output schema for one Gemini analysis
+_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "root_cause": {"type": "STRING"},
+        "recommended_action": {"type": "STRING"},
+        "risk_level": {"type": "STRING", "enum": ["low", "medium", "high"]},
+        "explanation": {"type": "STRING"},
+    },
+    "required": ["root_cause", "recommended_action", "risk_level", "explanation"],
+}
+
+# Container checks as (predicate, issue builder) pairs, scanned once per container
+# in this order. Builders take (pod_name, namespace, container_status, detected_at).
+_CONTAINER_RULES = (
+    # High restart count
+    (lambda cs: cs.restart_count > 3,
+     lambda pod, ns, cs, ts: {
+         "type": "high_restart_count", "severity": "warning", "pod": pod,
+         "namespace": ns, "container": cs.name, "restart_count": cs.restart_count,
+         "state": str(cs.state), "detected_at": ts,
+     }),
+    # Last termination was OOMKilled
+    (lambda cs: cs.last_state and cs.last_state.terminated
+     and cs.last_state.terminated.reason == "OOMKilled",
+     lambda pod, ns, cs, ts: {
+         "type": "oom_killed", "severity": "critical", "pod": pod,
+         "namespace": ns, "container": cs.name, "detected_at": ts,
+     }),
+    # Waiting in CrashLoopBackOff
+    (lambda cs: cs.state and cs.state.waiting
+     and cs.state.waiting.reason == "CrashLoopBackOff",
+     lambda pod, ns, cs, ts: {
+         "type": "crash_loop_backoff", "severity": "critical", "pod": pod,
+         "namespace": ns, "container": cs.name, "restart_count": cs.restart_count,
+         "detected_at": ts,
+     }),
+)
+
+# Pod memory usage over the last _METRICS_WINDOW_SECONDS, reduced server-side
+# to one (peak) point per pod
+_METRICS_WINDOW_SECONDS = 300
+_MEMORY_FILTER = (
+    'resource.type="k8s_pod" AND '
+    'resource.labels.namespace_name="{namespace}" AND '
+    'metric.type="kubernetes.io/pod/memory/used_bytes"'
+)
+
+# (second, ISO string) of the last _now_iso() call; replaced as a whole so
+# concurrent readers never see a mismatched pair
+_iso_cache = (0, "")
+
+# (connect, read) timeouts for watches. Bookmarks arrive about once a minute
+# even when nothing changes, so a read stalled this long means the connection
+# went half-open; the watch then reconnects instead of blocking forever.
+_WATCH_REQUEST_TIMEOUT = (10, 300)
+
+# Pods are expected to be Pending while they are scheduled and pull images, so a
+# Pending pod only counts as an issue once it has been around this long
+_PENDING_GRACE_SECONDS = 300
+
+# Completed pods need no healing, so the apiserver filters them out of pod
+# lists and watches (they show up as DELETED once they finish)
+_POD_FIELD_SELECTOR = "status.phase!=Succeeded"
+
+
+class WatchExpired(Exception):
+    """A watch's resourceVersion expired (410 Gone); events may have been missed."""
+
 
 class GCPMonitor:
     def __init__(self, project_id, cluster_name, vertex_ai_location="us-central1",
-                 model_name="gemini-2.0-flash-001"):
+                 model_name="gemini-2.0-flash-001", log_cache_seconds=60):
         self.project_id = project_id
         self.cluster_name = cluster_name
         self.vertex_ai_location = vertex_ai_location
@@ -32,11 +137,40 @@ class GCPMonitor:
             except config.ConfigException:
                 logger.warning("No Kubernetes config found — running in offline/demo mode")
 
-        self.k8s_apps = client.AppsV1Api()
-        self.k8s_core = client.CoreV1Api()
-
-        # Initialize Vertex AI client (lazy — only when needed)
+        # One pooled ApiClient for all Kubernetes calls (shared with HealingActions),
+        # so connections and their TLS sessions are reused instead of renegotiated
+        configuration = client.Configuration.get_default_copy()
+        configuration.connection_pool_maxsize = 32
+        # raise_on_status=False hands the last response back once retries run
+        # out, so callers still get an ApiException with the real status
+        configuration.retries = Retry(total=3, backoff_factor=0.2,
+                                      status_forcelist=[429, 500, 502, 503, 504],
+                                      raise_on_status=False)
+        self.api_client = client.ApiClient(configuration)
+        self.k8s_apps = client.AppsV1Api(self.api_client)
+        self.k8s_core = client.CoreV1Api(self.api_client)
+
+        # Last resourceVersion seen per (resource, namespace), so watches
+        # resume where the previous list or watch left off
+        self._resource_versions = {}
+
+        # Recent log fetches keyed by (namespace, pod, restart_count); a restart
+        # changes the key, so a new container's logs are always fetched fresh
+        self._log_cache = cachetools.TTLCache(maxsize=256, ttl=log_cache_seconds)
+        self._log_cache_lock = threading.Lock()
+
+        # Resolved pod → Deployment names keyed by (namespace, pod). A pod's owner
+        # never changes; guessed names are kept briefly so lookups that failed
+        # (e.g. a transient 404) are retried soon without hammering the apiserver
+        self._owner_cache = cachetools.TTLCache(maxsize=4096, ttl=3600)
+        self._owner_guess_cache = cachetools.TTLCache(maxsize=4096, ttl=300)
+        self._owner_lock = threading.Lock()
+
+        # Initialize Vertex AI client (lazy — only when needed). The client is
+        # built once and reused; it holds the ADC credentials and refreshes them
+        # itself. After a failed attempt, retry no sooner than _GENAI_RETRY_SECONDS.
         self._genai_model = None
+        self._genai_retry_at = 0.0
 
         # Initialize Cloud Monitoring client (optional)
         self._monitoring_client = None
@@ -44,125 +178,208 @@ class GCPMonitor:
 
     def _get_genai_model(self):
         """Lazy-load Google GenAI model."""
-        if self._genai_model is None:
+        if self._genai_model is None and time.time() >= self._genai_retry_at:
+            if genai is None:
+                logger.warning("google-genai not installed — AI analysis disabled")
+                self._genai_retry_at = float("inf")
+                return None
             try:
-                from google import genai
-
                 ai_client = genai.Client(
                     vertexai=True,
                     project=self.project_id,
                     location=self.vertex_ai_location,
                 )
                 self._genai_model = ai_client
-                logger.info(f"Initialized Vertex AI with model {self.model_name}")
-            except ImportError:
-                logger.warning("google-genai not installed — AI analysis disabled")
+                logger.info("Initialized Vertex AI with model %s", self.model_name)
             except Exception as e:
-                logger.warning(f"Could not initialize Vertex AI: {e}")
+                logger.warning("Could not initialize Vertex AI: %s", e)
+                self._genai_retry_at = time.time() + _GENAI_RETRY_SECONDS
         return self._genai_model
 
     def _get_monitoring_client(self):
         """Lazy-load Cloud Monitoring client."""
         if self._monitoring_client is None:
+            if monitoring_v3 is None:
+                logger.warning("google-cloud-monitoring not installed")
+                return None
             try:
-                from google.cloud import monitoring_v3
                 self._monitoring_client = monitoring_v3.MetricServiceClient()
                 logger.info("Initialized Cloud Monitoring client")
-            except ImportError:
-                logger.warning("google-cloud-monitoring not installed")
             except Exception as e:
-                logger.warning(f"Could not initialize monitoring client: {e}")
+                logger.warning("Could not initialize monitoring client: %s", e)
         return self._monitoring_client
 
-    def check_pod_health(self, namespace="cloud-aittt2026"):
-        """Check health of all pods in a namespace. Returns list of issues."""
+    def list_pods(self, namespace="cloud-aittt2026", record_version=True):
+        """List the pods in a namespace.
+
+        With record_version, pod watches resume from this list's resourceVersion.
+        """
+        pods = self.k8s_core.list_namespaced_pod(namespace, field_selector=_POD_FIELD_SELECTOR)
+        if record_version:
+            self._resource_versions[("pods", namespace)] = pods.metadata.resource_version
+        return pods.items
+
+    def check_pod_health(self, namespace="cloud-aittt2026", pods=None):
+        """Check health of pods in a namespace. Returns list of issues.
+
+        Checks the given pods (e.g. from a watch-fed cache), or lists the
+        namespace when none are given.
+        """
         issues = []
 
+        if pods is None:
+            try:
+                pods = self.list_pods(namespace)
+            except ApiException as e:
+                logger.error("Failed to list pods in namespace '%s': %s", namespace, e.reason)
+                return issues
+            except Exception as e:
+                logger.error("Unexpected error listing pods: %s", e)
+                return issues
+
+        detected_at = _now_iso()
+        for pod in pods:
+            # Pods on their way out need no healing
+            if pod.metadata.deletion_timestamp:
+                continue
+            issues.extend(self._check_pod(pod, namespace, detected_at))
+
+        return issues
+
+    def watch_pod_health(self, namespace="cloud-aittt2026"):
+        """Stream pod events for a namespace as (event_type, pod, issues) tuples.
+
+        Resumes from the last resourceVersion seen by a list or watch. The
+        generator ends when the apiserver closes the watch, and raises
+        WatchExpired when that version has expired (410 Gone), so the caller
+        can re-list before reconnecting.
+        """
+        for event_type, pod in self._watch(
+                self.k8s_core.list_namespaced_pod, namespace, ("pods", namespace),
+                field_selector=_POD_FIELD_SELECTOR):
+            # Pods on their way out need no healing
+            if event_type == "DELETED" or pod.metadata.deletion_timestamp:
+                yield event_type, pod, []
+            else:
+                yield event_type, pod, self._check_pod(pod, namespace)
+
+    def watch_workloads(self, kind, namespace="cloud-aittt2026"):
+        """Stream "replicasets" or "deployments" events as (event_type, object) pairs."""
+        list_funcs = {
+            "replicasets": self.k8s_apps.list_namespaced_replica_set,
+            "deployments": self.k8s_apps.list_namespaced_deployment,
+        }
+        return self._watch(list_funcs[kind], namespace, (kind, namespace))
+
+    def _watch(self, list_func, namespace, key, **kwargs):
+        """Yield (event_type, object) from a watch, tracking its resourceVersion under key.
+
+        Extra keyword arguments (e.g. field_selector) are passed to list_func.
+        Raises WatchExpired after forgetting a resourceVersion that has expired.
+        """
+        stream = watch.Watch().stream(
+            list_func,
+            namespace=namespace,
+            resource_version=self._resource_versions.get(key),
+            timeout_seconds=0,
+            allow_watch_bookmarks=True,
+            _request_timeout=_WATCH_REQUEST_TIMEOUT,
+            **kwargs,
+        )
         try:
-            pods = self.k8s_core.list_namespaced_pod(namespace)
+            for event in stream:
+                obj = event["object"]
+                self._resource_versions[key] = obj.metadata.resource_version
+                if event["type"] != "BOOKMARK":
+                    yield event["type"], obj
+        except ReadTimeoutError:
+            logger.info("Watch on %s in '%s' stalled — reconnecting", key[0], namespace)
         except ApiException as e:
-            logger.error(f"Failed to list pods in namespace '{namespace}': {e.reason}")
-            return issues
-        except Exception as e:
-            logger.error(f"Unexpected error listing pods: {e}")
-            return issues
-
-        for pod in pods.items:
-            pod_name = pod.metadata.name
-
-            # Check container statuses
-            container_statuses = pod.status.container_statuses or []
-            for cs in container_statuses:
-                # High restart count
-                if cs.restart_count > 3:
-                    issues.append({
-                        "type": "high_restart_count",
-                        "severity": "warning",
-                        "pod": pod_name,
-                        "namespace": namespace,
-                        "container": cs.name,
-                        "restart_count": cs.restart_count,
-                        "state": str(cs.state),
-                        "detected_at": datetime.utcnow().isoformat(),
-                    })
-
-                # OOMKilled detection
-                if cs.last_state and cs.last_state.terminated:
-                    if cs.last_state.terminated.reason == "OOMKilled":
-                        issues.append({
-                            "type": "oom_killed",
-                            "severity": "critical",
-                            "pod": pod_name,
-                            "namespace": namespace,
-                            "container": cs.name,
-                            "detected_at": datetime.utcnow().isoformat(),
-                        })
-
-                # CrashLoopBackOff detection
-                if cs.state and cs.state.waiting:
-                    if cs.state.waiting.reason == "CrashLoopBackOff":
-                        issues.append({
-                            "type": "crash_loop_backoff",
-                            "severity": "critical",
-                            "pod": pod_name,
-                            "namespace": namespace,
-                            "container": cs.name,
-                            "restart_count": cs.restart_count,
-                            "detected_at": datetime.utcnow().isoformat(),
-                        })
-
-            # Check pod phase
-            if pod.status.phase not in ("Running", "Succeeded"):
-                issues.append({
-                    "type": "pod_not_running",
-                    "severity": "warning",
-                    "pod": pod_name,
-                    "namespace": namespace,
-                    "phase": pod.status.phase,
-                    "reason": pod.status.reason or "Unknown",
-                    "detected_at": datetime.utcnow().isoformat(),
-                })
+            if e.status != 410:
+                raise
+            logger.info("Watch on %s in '%s' expired — resuming from current state",
+                        key[0], namespace)
+            self._resource_versions.pop(key, None)
+            raise WatchExpired(key) from e
+
+    def _check_pod(self, pod, namespace, detected_at=None):
+        """Return the list of issues found on a single pod."""
+        issues = []
+        pod_name = pod.metadata.name
+        if detected_at is None:
+            detected_at = _now_iso()
+
+        # Check container statuses
+        for cs in pod.status.container_statuses or []:
+            issues.extend(build(pod_name, namespace, cs, detected_at)
+                          for matches, build in _CONTAINER_RULES if matches(cs))
+
+        # Check pod phase
+        if self._pod_not_running(pod):
+            issues.append({
+                "type": "pod_not_running",
+                "severity": "warning",
+                "pod": pod_name,
+                "namespace": namespace,
+                "phase": pod.status.phase,
+                "reason": pod.status.reason or "Unknown",
+                "detected_at": detected_at,
+            })
 
         return issues
 
+    @staticmethod
+    def _pod_not_running(pod):
+        """Return True for a Failed or Unknown pod, or one stuck Pending past the grace period.
+
+        New pods from scale-ups, rollouts or our own delete_pod start out
+        Pending; a stuck one is caught by the next reconciliation pass.
+        """
+        phase = pod.status.phase
+        if phase in ("Running", "Succeeded"):
+            return False
+        if phase == "Pending":
+            created = pod.metadata.creation_timestamp
+            return created is not None and \
+                time.time() - created.timestamp() > _PENDING_GRACE_SECONDS
+        return True
+
     def get_deployment_for_pod(self, pod_name, namespace):
         """Safely resolve the owning Deployment name for a pod."""
+        cache_key = (namespace, pod_name)
+        with self._owner_lock:
+            deployment = self._owner_cache.get(cache_key) or \
+                self._owner_guess_cache.get(cache_key)
+        if deployment is not None:
+            return deployment
+
         try:
             pod = self.k8s_core.read_namespaced_pod(pod_name, namespace)
+            template_hash = (pod.metadata.labels or {}).get("pod-template-hash")
             for owner in (pod.metadata.owner_references or []):
                 if owner.kind == "ReplicaSet":
+                    # Deployments name their ReplicaSets "<deployment>-<pod-template-hash>",
+                    # which saves reading the ReplicaSet
+                    if template_hash and owner.name.endswith(f"-{template_hash}"):
+                        deployment = owner.name[:-len(template_hash) - 1]
+                        with self._owner_lock:
+                            self._owner_cache[cache_key] = deployment
+                        return deployment
                     rs = self.k8s_apps.read_namespaced_replica_set(owner.name, namespace)
                     for rs_owner in (rs.metadata.owner_references or []):
                         if rs_owner.kind == "Deployment":
+                            with self._owner_lock:
+                                self._owner_cache[cache_key] = rs_owner.name
                             return rs_owner.name
         except Exception as e:
-            logger.warning(f"Could not resolve deployment for pod {pod_name}: {e}")
+            logger.warning("Could not resolve deployment for pod %s: %s", pod_name, e)
 
         # Fallback: strip the last two segments (replicaset hash + pod hash)
         parts = pod_name.rsplit("-", 2)
-        if len(parts) >= 2:
-            return parts[0]
-        return pod_name
+        deployment = parts[0] if len(parts) >= 2 else pod_name
+        with self._owner_lock:
+            self._owner_guess_cache[cache_key] = deployment
+        return deployment
 
     def get_resource_metrics(self, namespace="cloud-aittt2026"):
         """Get resource utilization metrics from Cloud Monitoring."""
@@ -173,25 +390,20 @@ class GCPMonitor:
             return metrics
 
         try:
-            from google.cloud import monitoring_v3
-
-            project_name = f"projects/{self.project_id}"
-            interval = monitoring_v3.TimeInterval()
-            now = time.time()
-            interval.end_time.seconds = int(now)
-            interval.start_time.seconds = int(now - 300)
-
-            memory_filter = (
-                f'resource.type="k8s_pod" AND '
-                f'resource.labels.namespace_name="{namespace}" AND '
-                f'metric.type="kubernetes.io/pod/memory/used_bytes"'
-            )
-
+            now = int(time.time())
             results = monitoring_client.list_time_series(
                 request={
-                    "name": project_name,
-                    "filter": memory_filter,
-                    "interval": interval,
+                    "name": f"projects/{self.project_id}",
+                    "filter": _MEMORY_FILTER.format(namespace=namespace),
+                    "interval": {
+                        "start_time": {"seconds": now - _METRICS_WINDOW_SECONDS},
+                        "end_time": {"seconds": now},
+                    },
+                    "aggregation": {
+                        "alignment_period": {"seconds": _METRICS_WINDOW_SECONDS},
+                        "per_series_aligner": monitoring_v3.Aggregation.Aligner.ALIGN_MAX,
+                    },
+                    "page_size": 500,
                 }
             )
 
@@ -202,19 +414,26 @@ class GCPMonitor:
                         "memory_bytes": result.points[0].value.double_value,
                     }
         except Exception as e:
-            logger.error(f"Error fetching resource metrics: {e}")
+            logger.error("Error fetching resource metrics: %s", e)
 
         return metrics
 
-    def get_pod_logs(self, pod_name, namespace="cloud-aittt2026", lines=50):
-        """Fetch recent pod logs."""
-        try:
-            logs = self.k8s_core.read_namespaced_pod_log(
-                name=pod_name,
-                namespace=namespace,
-                tail_lines=lines,
-            )
+    def get_pod_logs(self, pod_name, namespace="cloud-aittt2026", tail_lines=50,
+                     since_seconds=None, restart_count=None):
+        """Fetch recent pod logs, limited to the last tail_lines within since_seconds.
+
+        The logs are compacted for prompting (see _compact_logs).
+        """
+        cache_key = (namespace, pod_name, restart_count)
+        with self._log_cache_lock:
+            logs = self._log_cache.get(cache_key)
+        if logs is not None:
             return logs
+
+        try:
+            logs = _compact_logs("".join(self.stream_pod_logs(
+                pod_name, namespace, tail_lines=tail_lines, since_seconds=since_seconds,
+            )))
         except ApiException as e:
             msg = f"K8s API error fetching logs for {pod_name}: {e.reason}"
             logger.warning(msg)
@@ -224,46 +443,158 @@ class GCPMonitor:
             logger.warning(msg)
             return msg
 
+        with self._log_cache_lock:
+            self._log_cache[cache_key] = logs
+        return logs
+
+    def stream_pod_logs(self, pod_name, namespace="cloud-aittt2026", tail_lines=200,
+                        since_seconds=None):
+        """Yield the last _MAX_LOG_BYTES of a pod's log as text chunks.
+
+        The response body is read in chunks and only the tail is kept, so a
+        large log is never held in memory as a whole.
+        """
+        response = self.k8s_core.read_namespaced_pod_log(
+            name=pod_name,
+            namespace=namespace,
+            tail_lines=tail_lines,
+            since_seconds=since_seconds,
+            _preload_content=False,
+            _request_timeout=_LOG_REQUEST_TIMEOUT,
+        )
+        chunks = deque()
+        size = 0
+        try:
+            for chunk in response.stream(4096):
+                chunks.append(chunk)
+                size += len(chunk)
+                while size - len(chunks[0]) >= _MAX_LOG_BYTES:
+                    size -= len(chunks.popleft())
+        finally:
+            response.release_conn()
+
+        if size > _MAX_LOG_BYTES:
+            # Drop the partial first line left by trimming to the byte budget
+            head = chunks[0][size - _MAX_LOG_BYTES:]
+            newline = head.find(b"\n")
+            chunks[0] = head[newline + 1:] if newline >= 0 else head
+        # Decode incrementally so characters split across chunks stay intact
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        for chunk in chunks:
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
     def analyze_with_gemini(self, issue_data, logs):
         """Send issue context to Gemini for AI-powered root-cause analysis."""
-        prompt = (
+        prompt = "".join((
             "You are an expert Kubernetes SRE. Analyze the following issue and "
             "provide a structured JSON response with keys: root_cause, recommended_action, "
             "risk_level (low/medium/high), and explanation.\n\n"
             f"Issue Data:\n{issue_data}\n\n"
-            f"Recent Pod Logs:\n{logs}\n\n"
-            "Respond ONLY with valid JSON."
-        )
+            "Recent Pod Logs:\n", logs,
+        ))
 
         ai_client = self._get_genai_model()
         if ai_client is None:
             logger.info("AI analysis unavailable — returning default analysis")
-            return {
-                "root_cause": f"Detected {issue_data.get('type', 'unknown')} issue",
-                "recommended_action": "apply_default_healing",
-                "risk_level": "medium",
-                "explanation": "AI analysis unavailable; applying rule-based healing.",
-            }
+            return _default_analysis(
+                issue_data, "AI analysis unavailable; applying rule-based healing.")
 
         try:
-            response = ai_client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-            )
-            import json
-            # Try to parse JSON from response
-            text = response.text.strip()
-            # Handle markdown code blocks
-            if text.startswith("```"):
-                text = text.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-            analysis = json.loads(text)
-            logger.info(f"Gemini analysis: {analysis.get('root_cause', 'N/A')}")
+            analysis = self._generate_json(ai_client, prompt, _ANALYSIS_SCHEMA)
+            logger.info("Gemini analysis: %s", analysis.get('root_cause', 'N/A'))
             return analysis
         except Exception as e:
-            logger.warning(f"Gemini analysis failed: {e}")
-            return {
-                "root_cause": f"Detected {issue_data.get('type', 'unknown')} issue",
-                "recommended_action": "apply_default_healing",
-                "risk_level": "medium",
-                "explanation": f"AI analysis error: {e}. Applying rule-based healing.",
-            }
+            logger.warning("Gemini analysis failed: %s", e)
+            return _default_analysis(
+                issue_data, f"AI analysis error: {e}. Applying rule-based healing.")
+
+    def analyze_batch(self, issues, logs):
+        """Analyze several unrelated issues in one Gemini request.
+
+        logs[i] holds the logs for issues[i]. Returns one analysis per issue,
+        in the same order.
+        """
+        if len(issues) == 1:
+            return [self.analyze_with_gemini(issues[0], logs[0])]
+
+        parts = [
+            "You are an expert Kubernetes SRE. Analyze each of the following "
+            f"{len(issues)} independent issues. For each one provide a JSON object "
+            "with keys: root_cause, recommended_action, risk_level (low/medium/high), "
+            "and explanation.\n\n",
+        ]
+        for number, (issue_data, issue_logs) in enumerate(zip(issues, logs), start=1):
+            parts += (f"### Issue {number}\nIssue Data:\n{issue_data}\n\n"
+                      "Recent Pod Logs:\n", issue_logs, "\n\n")
+        parts.append("Respond with one analysis per issue, in the same order as the issues.")
+        prompt = "".join(parts)
+
+        ai_client = self._get_genai_model()
+        if ai_client is None:
+            logger.info("AI analysis unavailable — returning default analyses")
+            return [_default_analysis(
+                issue_data, "AI analysis unavailable; applying rule-based healing.")
+                for issue_data in issues]
+
+        try:
+            analyses = self._generate_json(
+                ai_client, prompt, {"type": "ARRAY", "items": _ANALYSIS_SCHEMA})
+            if len(analyses) != len(issues):
+                raise ValueError(f"expected a JSON array of {len(issues)} analyses")
+            logger.info("Gemini analyzed %s issues in one request", len(issues))
+            return analyses
+        except Exception as e:
+            logger.warning("Gemini batch analysis failed: %s", e)
+            return [_default_analysis(
+                issue_data, f"AI analysis error: {e}. Applying rule-based healing.")
+                for issue_data in issues]
+
+    def _generate_json(self, ai_client, prompt, schema):
+        """Run a prompt through Gemini in JSON mode and return the parsed response."""
+        response = ai_client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config={"response_mime_type": "application/json", "response_schema": schema},
+        )
+        if response.parsed is None:
+            raise ValueError("Gemini returned no JSON matching the response schema")
+        return response.parsed
+
+
+def _now_iso():
+    """Return the current UTC time as an ISO string, at one-second resolution.
+
+    The string is built at most once per second however many issues are stamped.
+    """
+    global _iso_cache
+    now = int(time.time())
+    cached = _iso_cache
+    if cached[0] != now:
+        cached = (now, datetime.utcfromtimestamp(now).isoformat())
+        _iso_cache = cached
+    return cached[1]
+
+
+def _compact_logs(logs):
+    """Strip timestamps, drop repeated lines and keep the last _MAX_DISTINCT_LOG_LINES.
+
+    Each line is kept at its last occurrence, so the output stays in log order.
+    """
+    lines = [_LOG_TIMESTAMP.sub("", line) for line in logs.splitlines() if line.strip()]
+    distinct = list(dict.fromkeys(reversed(lines)))[:_MAX_DISTINCT_LOG_LINES]
+    distinct.reverse()
+    suppressed = len(lines) - len(distinct)
+    if suppressed:
+        distinct.append(f"… ({suppressed} duplicate or older lines suppressed)")
+    return "\n".join(distinct)
+
+
+def _default_analysis(issue_data, explanation):
+    """Rule-based analysis used when Gemini can't provide one."""
+    return {
+        "root_cause": f"Detected {issue_data.get('type', 'unknown')} issue",
+        "recommended_action": "apply_default_healing",
+        "risk_level": "medium",
+        "explanation": explanation,
+    }
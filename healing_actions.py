@@ -3,42 +3,52 @@ Self-Healing Actions for GKE
 Provides Kubernetes remediation actions with safety controls.
 """
 
-import json
 import logging
 import time
-from collections import defaultdict
+from collections import deque
 from datetime import datetime
 
+import cachetools
+import orjson
 from kubernetes import client
 from kubernetes.client.rest import ApiException
 
 logger = logging.getLogger("self-healing-agent.healer")
 
+# Most incidents kept in memory; older ones are handed to the archive callback
+_MAX_INCIDENTS = 1024
+
 
 class HealingActions:
-    def __init__(self, dry_run=False, max_actions_per_hour=20, cooldown_seconds=60):
+    def __init__(self, dry_run=False, max_actions_per_hour=20, cooldown_seconds=60,
+                 api_client=None, archive=None):
         self.dry_run = dry_run
         self.max_actions_per_hour = max_actions_per_hour
         self.cooldown_seconds = cooldown_seconds
-        self.k8s_apps = client.AppsV1Api()
-        self.k8s_core = client.CoreV1Api()
+        # api_client lets the healer share the monitor's connection pool
+        self.k8s_apps = client.AppsV1Api(api_client)
+        self.k8s_core = client.CoreV1Api(api_client)
 
-        # Track actions for rate limiting
-        self._action_log = []
-        self._last_action_time = defaultdict(float)
+        # Track actions for rate limiting; the log holds at most an hour of
+        # actions, and cooldown entries are dropped once their cooldown is over
+        self._action_log = deque()
+        self._last_action_time = cachetools.TTLCache(maxsize=4096, ttl=cooldown_seconds)
 
-        # Incident history
-        self.incidents = []
+        # Incident history. Once full, the oldest incident is passed to
+        # archive(incident) before it is evicted (or dropped if there is none)
+        self.incidents = deque(maxlen=_MAX_INCIDENTS)
+        self._archive = archive
 
     def _check_rate_limit(self):
         """Enforce rate limit on healing actions."""
         now = time.time()
         one_hour_ago = now - 3600
-        self._action_log = [t for t in self._action_log if t > one_hour_ago]
+        while self._action_log and self._action_log[0] <= one_hour_ago:
+            self._action_log.popleft()
         if len(self._action_log) >= self.max_actions_per_hour:
             logger.warning(
-                f"Rate limit reached: {len(self._action_log)}/{self.max_actions_per_hour} "
-                "actions in the last hour"
+                "Rate limit reached: %s/%s actions in the last hour",
+                len(self._action_log), self.max_actions_per_hour,
             )
             return False
         return True
@@ -49,7 +59,7 @@ class HealingActions:
         last = self._last_action_time.get(resource_key, 0)
         if now - last < self.cooldown_seconds:
             remaining = int(self.cooldown_seconds - (now - last))
-            logger.info(f"Cooldown active for {resource_key} — {remaining}s remaining")
+            logger.info("Cooldown active for %s — %ss remaining", resource_key, remaining)
             return False
         return True
 
@@ -73,7 +83,8 @@ class HealingActions:
                     "new_replicas": replicas, "message": msg}
 
         try:
-            body = {"spec": {"replicas": replicas}}
+            # A list body is sent as a JSON Patch
+            body = [{"op": "replace", "path": "/spec/replicas", "value": replicas}]
             self.k8s_apps.patch_namespaced_deployment_scale(
                 name=name, namespace=namespace, body=body
             )
@@ -84,14 +95,19 @@ class HealingActions:
                     "deployment": name, "namespace": namespace,
                     "new_replicas": replicas, "message": msg}
         except ApiException as e:
-            logger.error(f"Failed to scale {namespace}/{name}: {e.reason}")
+            logger.error("Failed to scale %s/%s: %s", namespace, name, e.reason)
             return {"success": False, "error": e.reason}
         except Exception as e:
-            logger.error(f"Unexpected error scaling {namespace}/{name}: {e}")
+            logger.error("Unexpected error scaling %s/%s: %s", namespace, name, e)
             return {"success": False, "error": str(e)}
 
-    def increase_resource_limits(self, deployment_name, namespace, memory_limit, cpu_limit):
-        """Increase resource limits for all containers in a deployment."""
+    def increase_resource_limits(self, deployment_name, namespace, memory_limit, cpu_limit,
+                                 container_names=None):
+        """Increase resource limits for all containers in a deployment.
+
+        container_names saves reading the deployment when the caller already
+        knows its containers.
+        """
         resource_key = f"limits:{namespace}/{deployment_name}"
         if not self._check_rate_limit() or not self._check_cooldown(resource_key):
             return {"success": False, "error": "Rate limited or in cooldown"}
@@ -106,26 +122,36 @@ class HealingActions:
                     "message": msg}
 
         try:
-            deployment = self.k8s_apps.read_namespaced_deployment(
-                deployment_name, namespace
-            )
-
-            for container in deployment.spec.template.spec.containers:
-                if container.resources is None:
-                    container.resources = client.V1ResourceRequirements()
-                if container.resources.limits is None:
-                    container.resources.limits = {}
-                if container.resources.requests is None:
-                    container.resources.requests = {}
-
-                container.resources.limits["memory"] = memory_limit
-                container.resources.limits["cpu"] = cpu_limit
-                # Also bump requests to be reasonable
-                container.resources.requests["memory"] = memory_limit
-                container.resources.requests["cpu"] = cpu_limit
-
+            if container_names is None:
+                deployment = self.k8s_apps.read_namespaced_deployment(
+                    deployment_name, namespace
+                )
+                container_names = [c.name for c in deployment.spec.template.spec.containers]
+
+            # Strategic merge patch: containers are merged by name, so only the
+            # resources stanza is sent and other changes to the spec are kept.
+            # Requests are bumped to match the new limits.
+            resources = {
+                "limits": {"memory": memory_limit, "cpu": cpu_limit},
+                "requests": {"memory": memory_limit, "cpu": cpu_limit},
+            }
+            body = {
+                "spec": {
+                    "template": {
+                        "spec": {
+                            "containers": [
+                                {"name": name, "resources": resources}
+                                for name in container_names
+                            ]
+                        }
+                    }
+                }
+            }
+            # Pinned explicitly: a JSON merge patch would replace the whole
+            # containers list with these name+resources stubs
             self.k8s_apps.patch_namespaced_deployment(
-                name=deployment_name, namespace=namespace, body=deployment
+                name=deployment_name, namespace=namespace, body=body,
+                _content_type="application/strategic-merge-patch+json",
             )
             self._record_action(resource_key)
             msg = f"Increased resource limits for {namespace}/{deployment_name}"
@@ -135,10 +161,11 @@ class HealingActions:
                     "new_limits": {"memory": memory_limit, "cpu": cpu_limit},
                     "message": msg}
         except ApiException as e:
-            logger.error(f"Failed to update limits for {namespace}/{deployment_name}: {e.reason}")
+            logger.error("Failed to update limits for %s/%s: %s",
+                         namespace, deployment_name, e.reason)
             return {"success": False, "error": e.reason}
         except Exception as e:
-            logger.error(f"Unexpected error updating limits: {e}")
+            logger.error("Unexpected error updating limits: %s", e)
             return {"success": False, "error": str(e)}
 
     def restart_deployment(self, name, namespace):
@@ -175,10 +202,10 @@ class HealingActions:
             return {"success": True, "action": "restart_deployment",
                     "deployment": name, "namespace": namespace, "message": msg}
         except ApiException as e:
-            logger.error(f"Failed to restart {namespace}/{name}: {e.reason}")
+            logger.error("Failed to restart %s/%s: %s", namespace, name, e.reason)
             return {"success": False, "error": e.reason}
         except Exception as e:
-            logger.error(f"Unexpected error restarting deployment: {e}")
+            logger.error("Unexpected error restarting deployment: %s", e)
             return {"success": False, "error": str(e)}
 
     def delete_pod(self, pod_name, namespace):
@@ -203,10 +230,10 @@ class HealingActions:
             return {"success": True, "action": "delete_pod",
                     "pod": pod_name, "namespace": namespace, "message": msg}
         except ApiException as e:
-            logger.error(f"Failed to delete pod {namespace}/{pod_name}: {e.reason}")
+            logger.error("Failed to delete pod %s/%s: %s", namespace, pod_name, e.reason)
             return {"success": False, "error": e.reason}
         except Exception as e:
-            logger.error(f"Unexpected error deleting pod: {e}")
+            logger.error("Unexpected error deleting pod: %s", e)
             return {"success": False, "error": str(e)}
 
     def generate_incident_report(self, issue, analysis, action_taken):
@@ -233,7 +260,7 @@ class HealingActions:
 
 ## Action Taken
 ```json
-{json.dumps(action_taken, indent=2)}
+{orjson.dumps(action_taken, option=orjson.OPT_INDENT_2).decode()}
 ```
 
 ## Resolution Status
@@ -248,6 +275,8 @@ class HealingActions:
             "action": action_taken,
             "report": report,
         }
+        if len(self.incidents) == self.incidents.maxlen and self._archive is not None:
+            self._archive(self.incidents[0])
         self.incidents.append(incident)
 
         return report